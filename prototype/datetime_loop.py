@@ -15,19 +15,26 @@ def main():
     print("-" * 50)
     sys.stdout.flush()
 
+    now = datetime.now
+    write = sys.stdout.write
+    flush = sys.stdout.flush
+
     iteration = 0
+    deadline = time.monotonic()
     while True:
         iteration += 1
-        current_time = datetime.now().astimezone()
-        timezone = current_time.tzname()
+        current_time = now().astimezone()
 
-        print(
-            f"[Iteration {iteration}] {current_time.strftime('%Y-%m-%d %H:%M:%S')} {timezone}"
+        write(
+            f"[Iteration {iteration}] {current_time:%Y-%m-%d %H:%M:%S} "
+            f"{current_time.tzname()}\n"
         )
-        sys.stdout.flush()
+        flush()
 
-        # Sleep for 60 minutes (3600 seconds)
-        time.sleep(3600)
+        # Sleep until the next 60-minute (3600 seconds) deadline, so that
+        # late wakeups don't accumulate drift across iterations
+        deadline += 3600
+        time.sleep(max(0, deadline - time.monotonic()))
 
 
 if __name__ == "__main__":
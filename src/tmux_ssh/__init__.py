@@ -1,12 +1,17 @@
 """tmux_ssh - Execute remote commands via SSH in tmux sessions."""
 
-from tmux_ssh.client import (
-    EXIT_BLOCKED,
-    EXIT_COMPLETED,
-    EXIT_ERROR,
-    EXIT_STILL_RUNNING,
-    TmuxSSHClient,
-)
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from tmux_ssh.client import (
+        EXIT_BLOCKED,
+        EXIT_COMPLETED,
+        EXIT_ERROR,
+        EXIT_STILL_RUNNING,
+        TmuxSSHClient,
+    )
 
 __version__ = "0.1.0"
 __all__ = [
@@ -16,3 +21,12 @@ __all__ = [
     "EXIT_STILL_RUNNING",
     "TmuxSSHClient",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the client module on first access to one of its exports."""
+    if name in __all__:
+        from tmux_ssh import client
+
+        return getattr(client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,56 +2,220 @@
 
 from __future__ import annotations
 
-import argparse
-import json
+import contextlib
+import functools
 import os
 import sys
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, NamedTuple
 
-from tmux_ssh.client import (
-    EXIT_COMPLETED,
-    Config,
-    TmuxSSHClient,
-    error,
-    warning,
-)
+if TYPE_CHECKING:
+    import argparse
+    from collections.abc import Callable
 
-# Config file for persisting host/user
-CONFIG_FILE = os.path.expanduser("~/.tmux4ssh_config")
+    from tmux_ssh.client import TmuxSSHClient
 
 
-def load_saved_config() -> dict[str, str | bool | int]:
-    """Load saved host/user/settings from config file."""
-    if os.path.exists(CONFIG_FILE):
+@functools.cache
+def _config_file() -> str:
+    """Get the config file for persisting host/user (TMUX_SSH_CONFIG overrides)."""
+    return os.environ.get("TMUX_SSH_CONFIG") or os.path.expanduser("~/.tmux4ssh_config")
+
+
+@functools.cache
+def _state_dir() -> str:
+    """Get the directory for per-host state (last server behind each host).
+
+    With TMUX_SSH_CONFIG set, state lives next to that config file instead.
+    """
+    if os.environ.get("TMUX_SSH_CONFIG"):
+        return os.path.dirname(os.path.abspath(_config_file()))
+    return os.path.expanduser("~/.tmux_ssh")
+
+
+class SavedConfig(NamedTuple):
+    """Settings persisted between invocations."""
+
+    host: str | None = None
+    user: str | None = None
+    port: int = 22
+    auto_new_session: bool = True
+    last_server: str | None = None  # Only in configs written by older versions
+
+
+def _saved_from_dict(data: dict[str, object]) -> SavedConfig:
+    """Build a SavedConfig from raw values, ignoring any of the wrong type."""
+    host = data.get("host")
+    user = data.get("user")
+    port = data.get("port")
+    auto = data.get("auto_new_session")
+    last_server = data.get("last_server")
+    return SavedConfig(
+        host=host if isinstance(host, str) and host else None,
+        user=user if isinstance(user, str) and user else None,
+        port=port if isinstance(port, int) and not isinstance(port, bool) else 22,
+        auto_new_session=auto if isinstance(auto, bool) else True,
+        last_server=(
+            last_server if isinstance(last_server, str) and last_server else None
+        ),
+    )
+
+
+def _parse_config(text: str) -> SavedConfig:
+    """Parse ``key=value`` lines into a SavedConfig."""
+    data: dict[str, object] = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            data[key] = value
+    # Unparseable values stay strings so _saved_from_dict falls back to defaults
+    port = data.get("port")
+    if isinstance(port, str):
+        with contextlib.suppress(ValueError):
+            data["port"] = parse_port(port)
+    auto = data.get("auto_new_session")
+    if auto in ("True", "False"):
+        data["auto_new_session"] = auto == "True"
+    return _saved_from_dict(data)
+
+
+def _read_small_file(path: str) -> str | None:
+    """Read a small text file without building a buffered file object."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        return os.read(fd, 4096).decode()
+    except (OSError, UnicodeDecodeError):
+        return None
+    finally:
+        os.close(fd)
+
+
+def _atomic_write(path: str, payload: bytes) -> None:
+    """Write payload to path via a temp file and rename.
+
+    The temp file is per-process, so concurrent invocations never write into
+    each other's temp file; the last rename wins with a complete file.
+    """
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    try:
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
         try:
-            with open(CONFIG_FILE) as f:
-                data: dict[str, str | bool | int] = json.load(f)
-                return data
-        except (json.JSONDecodeError, OSError):
-            pass
-    return {}
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, path)
+    except OSError:
+        # Silently fail if we can't write, but don't leave the temp file behind
+        with contextlib.suppress(OSError):
+            os.remove(tmp_file)
+
+
+def _write_config(config: SavedConfig) -> None:
+    """Atomically write config as ``key=value`` lines."""
+    payload = "".join(
+        f"{key}={value}\n"
+        for key, value in config._asdict().items()
+        if value is not None
+    )
+    _atomic_write(_config_file(), payload.encode())
+
+
+@functools.lru_cache(maxsize=1)
+def _read_config(path: str, mtime_ns: int, size: int) -> SavedConfig:
+    """Parse the config file; cached per (path, mtime_ns, size)."""
+    text = _read_small_file(path)
+    if text is None:
+        return SavedConfig()
+
+    if not text.lstrip().startswith("{"):
+        return _parse_config(text)
+
+    # Migrate the JSON format written by older versions
+    import json
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return SavedConfig()
+    if not isinstance(data, dict):
+        return SavedConfig()
+    saved = _saved_from_dict(data)
+    _write_config(saved)
+    return saved
+
+
+def load_saved_config() -> SavedConfig:
+    """Load saved host/user/settings from config file.
+
+    The file is only re-parsed when its mtime or size changes.
+    """
+    config_file = _config_file()
+    try:
+        st = os.stat(config_file)
+    except OSError:
+        return SavedConfig()
+    return _read_config(config_file, st.st_mtime_ns, st.st_size)
 
 
 def save_config(
     host: str,
     user: str,
-    last_server: str | None = None,
     auto_new_session: bool = True,
     port: int = 22,
+    saved: SavedConfig | None = None,
 ) -> None:
-    """Save host/user/last_server/settings to config file for future use."""
-    config: dict[str, str | bool | int] = {
-        "host": host,
-        "user": user,
-        "port": port,
-        "auto_new_session": auto_new_session,
-    }
-    if last_server:
-        config["last_server"] = last_server
+    """Save host/user/settings to config file for future use.
+
+    The write is skipped if the config on disk already matches; ``saved``
+    may be passed to reuse an already loaded config for that comparison.
+    """
+    config = SavedConfig(
+        host=host, user=user, port=port, auto_new_session=auto_new_session
+    )
+    if saved is None:
+        saved = load_saved_config()
+    if config != saved:
+        _write_config(config)
+
+
+def _last_server_file(host: str) -> str:
+    """Get the state file recording the last server reached through host."""
+    return os.path.join(_state_dir(), f"last_server_{host.replace(os.sep, '_')}")
+
+
+def load_last_server(host: str) -> str | None:
+    """Load the server last reached through host, if known."""
+    text = _read_small_file(_last_server_file(host))
+    if text is None:
+        return None
+    return text.strip() or None
+
+
+def save_last_server(host: str, server: str) -> None:
+    """Remember the server reached through host for change detection."""
     try:
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(config, f)
+        os.makedirs(_state_dir(), exist_ok=True)
     except OSError:
-        pass  # Silently fail if we can't write
+        return
+    _atomic_write(_last_server_file(host), f"{server}\n".encode())
+
+
+def parse_port(port_str: str) -> int:
+    """
+    Parse an SSH port number.
+
+    Raises:
+        ValueError: If port is not a valid integer or out of range
+    """
+    if not port_str.isdigit():
+        raise ValueError(f"Invalid port: '{port_str}'")
+    port = int(port_str)
+    if not 1 <= port <= 65535:
+        raise ValueError(f"Port out of range: {port}")
+    return port
 
 
 def parse_connection_target(arg: str) -> tuple[str | None, str | None, int | None]:
@@ -70,32 +234,81 @@ def parse_connection_target(arg: str) -> tuple[str | None, str | None, int | Non
     Raises:
         ValueError: If port is not a valid integer or out of range
     """
-    user = None
-    port = None
-
     # Extract user if present
-    if "@" in arg:
-        user, host_part = arg.split("@", 1)
-    else:
-        host_part = arg
+    user, sep, host_part = arg.partition("@")
+    if not sep:
+        user, host_part = "", user
 
     # Extract port if present
-    if ":" in host_part:
-        host, port_str = host_part.rsplit(":", 1)
-        if not port_str.isdigit():
-            raise ValueError(f"Invalid port: '{port_str}'")
-        port = int(port_str)
-        if port < 1 or port > 65535:
-            raise ValueError(f"Port out of range: {port}")
+    port = None
+    host, sep, port_str = host_part.rpartition(":")
+    if not sep:
+        host = port_str
     else:
-        host = host_part
+        port = parse_port(port_str)
 
     return (user if user else None, host if host else None, port)
 
 
-def main(args: list[str] | None = None) -> int:
-    """Main entry point for the CLI."""
-    saved = load_saved_config()
+# Flags the fast-path parser understands, mapped to their attribute names
+_FAST_FLAGS = {"-n": "new", "-f": "force", "-y": "yes"}
+
+
+def _default_args() -> SimpleNamespace:
+    """Return parsed arguments with every option at its default.
+
+    Must be kept in sync with the defaults declared in _get_parser().
+    """
+    return SimpleNamespace(
+        host=None,
+        user=None,
+        port=None,
+        clear=False,
+        timeout=None,
+        idle_timeout=3600,
+        new=False,
+        force=False,
+        attach=None,
+        list=False,
+        cleanup=False,
+        kill=None,
+        yes=False,
+        auto=None,
+        positional=[],
+    )
+
+
+def _fast_parse(argv: list[str]) -> SimpleNamespace | None:
+    """Parse the common ``[-n] [-f] [-y] [user@host] [command...]`` shape.
+
+    Returns None if argv uses anything else, in which case argparse is needed.
+    """
+    parsed = _default_args()
+    positional: list[str] = []
+    positional_done = False
+    for token in argv:
+        if token in _FAST_FLAGS:
+            setattr(parsed, _FAST_FLAGS[token], True)
+            positional_done = bool(positional)
+        elif token.startswith("-") or positional_done:
+            # argparse only accepts one contiguous run of positionals
+            return None
+        else:
+            positional.append(token)
+    parsed.positional = positional
+    return parsed
+
+
+@functools.cache
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the full argparse parser (once per process)."""
+    import argparse
+
+    def port_type(value: str) -> int:
+        try:
+            return parse_port(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e)) from e
 
     parser = argparse.ArgumentParser(
         description="Run remote commands in a tmux session via SSH (batch mode).",
@@ -104,11 +317,12 @@ def main(args: list[str] | None = None) -> int:
             "(&&, ||, |, >, etc.), variables ($VAR), wildcards (*), or flags (-la). "
             'Example: tmux-ssh user@host "cmd1 && cmd2"'
         ),
+        allow_abbrev=False,
     )
     parser.add_argument("-H", "--host", default=None, help="Remote hostname")
     parser.add_argument("-U", "--user", default=None, help="Remote username")
     parser.add_argument(
-        "-p", "--port", type=int, default=None, help="SSH port (default: 22)"
+        "-p", "--port", type=port_type, default=None, help="SSH port (default: 22)"
     )
     parser.add_argument(
         "-C", "--clear", action="store_true", help="Clear stored credentials"
@@ -193,7 +407,36 @@ def main(args: list[str] | None = None) -> int:
         help='[user@host[:port]] ["command"] - quote commands with special chars',
     )
 
-    parsed_args = parser.parse_args(args)
+    return parser
+
+
+def _slow_parse(argv: list[str]) -> SimpleNamespace:
+    """Parse arguments with the full argparse parser."""
+    return _get_parser().parse_args(argv, namespace=SimpleNamespace())
+
+
+def _looks_like_target(arg: str) -> bool:
+    """Check if a positional looks like a connection target.
+
+    True if it contains @ or is a hostname-like string without spaces/slashes.
+    """
+    if "@" in arg:
+        return True
+    return (
+        "." in arg  # Likely a hostname
+        and not arg.startswith("-")
+        and "/" not in arg
+        and " " not in arg
+    )
+
+
+def main(args: list[str] | None = None) -> int:
+    """Main entry point for the CLI."""
+    argv = sys.argv[1:] if args is None else args
+    parsed_args = _fast_parse(argv) or _slow_parse(argv)
+    saved = load_saved_config()
+
+    from tmux_ssh.client import Config, TmuxSSHClient, error, warning
 
     # Parse positional arguments to extract connection target
     positionals = parsed_args.positional
@@ -204,14 +447,7 @@ def main(args: list[str] | None = None) -> int:
 
     if positionals:
         first_arg = positionals[0]
-        # Check if first arg looks like a connection target
-        # (contains @ or is a hostname-like string without spaces/slashes)
-        if "@" in first_arg or (
-            not first_arg.startswith("-")
-            and "/" not in first_arg
-            and " " not in first_arg
-            and "." in first_arg  # Likely a hostname
-        ):
+        if _looks_like_target(first_arg):
             try:
                 target_user, target_host, target_port = parse_connection_target(
                     first_arg
@@ -225,119 +461,121 @@ def main(args: list[str] | None = None) -> int:
             command_args = positionals
 
     # Conflict detection with warnings
-    if target_host and parsed_args.host:
-        print(
-            warning(
-                f"Both '{positionals[0]}' and -H '{parsed_args.host}' "
-                f"provided. Using '{target_host}'."
-            )
-        )
-    if target_user and parsed_args.user:
-        print(
-            warning(
-                f"Both '{positionals[0]}' and -U '{parsed_args.user}' "
-                f"provided. Using '{target_user}'."
-            )
-        )
-    if target_port and parsed_args.port:
-        print(
-            warning(
-                f"Both '{positionals[0]}' and -p '{parsed_args.port}' "
-                f"provided. Using port {target_port}."
+    for flag, flag_value, target_value, using in (
+        ("-H", parsed_args.host, target_host, "'{}'"),
+        ("-U", parsed_args.user, target_user, "'{}'"),
+        ("-p", parsed_args.port, target_port, "port {}"),
+    ):
+        if target_value and flag_value:
+            print(
+                warning(
+                    f"Both '{positionals[0]}' and {flag} '{flag_value}' "
+                    f"provided. Using {using.format(target_value)}."
+                )
             )
-        )
 
     # Resolve host: positional > CLI flag > saved config > prompt
-    saved_host = saved.get("host")
-    host = (
-        target_host
-        or parsed_args.host
-        or (saved_host if isinstance(saved_host, str) else None)
-    )
+    host = target_host or parsed_args.host or saved.host
     if not host:
-        host = input("[?] Enter remote hostname: ").strip()
+        # Only prompt when run interactively; scripts get an error instead
+        if sys.stdin.isatty():
+            host = input("[?] Enter remote hostname: ").strip()
         if not host:
             print(error("Hostname is required."))
             return 1
 
     # Resolve user: positional > CLI flag > saved config > prompt
-    saved_user = saved.get("user")
-    user = (
-        target_user
-        or parsed_args.user
-        or (saved_user if isinstance(saved_user, str) else None)
-    )
+    user = target_user or parsed_args.user or saved.user
     if not user:
-        user = input("[?] Enter remote username: ").strip()
+        if sys.stdin.isatty():
+            user = input("[?] Enter remote username: ").strip()
         if not user:
             print(error("Username is required."))
             return 1
 
     # Resolve port: positional > CLI flag > saved config > default (22)
-    saved_port = saved.get("port", 22)
-    port = (
-        target_port
-        or parsed_args.port
-        or (saved_port if isinstance(saved_port, int) else 22)
-    )
+    port = target_port or parsed_args.port or saved.port
 
     # Resolve auto: CLI arg > saved config > default (True)
-    if parsed_args.auto is not None:
-        auto = parsed_args.auto
-    else:
-        saved_auto = saved.get("auto_new_session", True)
-        auto = saved_auto if isinstance(saved_auto, bool) else True
+    auto = parsed_args.auto if parsed_args.auto is not None else saved.auto_new_session
 
-    # Get last_server from saved config
-    saved_last_server = saved.get("last_server")
-    last_server: str | None = (
-        saved_last_server if isinstance(saved_last_server, str) else None
-    )
+    # Older configs stored last_server alongside host/user; move it to the
+    # saved host's state file (even if this run uses another host), as
+    # save_config() below drops it
+    if saved.host and saved.last_server and load_last_server(saved.host) is None:
+        save_last_server(saved.host, saved.last_server)
 
-    # Save for future use (without last_server yet, will update after connection)
-    save_config(host, user, last_server, auto, port)
+    # Get last_server for this host
+    last_server = load_last_server(host)
 
     config = Config(hostname=host, username=user, port=port)
     client = TmuxSSHClient(config, last_server=last_server)
 
+    try:
+        return _dispatch(client, parsed_args, command_args, auto)
+    finally:
+        # Save for future use, including the server we ended up connected to
+        save_config(host, user, auto, port, saved)
+        if client.current_server and client.current_server != last_server:
+            save_last_server(host, client.current_server)
+
+
+def _dispatch(
+    client: TmuxSSHClient,
+    parsed_args: SimpleNamespace,
+    command_args: list[str],
+    auto: bool,
+) -> int:
+    """Run the operation selected on the command line."""
+    from tmux_ssh.client import EXIT_COMPLETED, error
+
     if parsed_args.clear:
         client.clear_credentials()
         return EXIT_COMPLETED
 
+    # Verbs can be combined (e.g. --list --attach); they run in this order
+    # over a single SSH connection, stopping at the first failure
+    actions: list[Callable[[], int]] = []
     if parsed_args.list:
-        result = client.list_running()
-        # Save current server for next time
-        if client.current_server:
-            save_config(host, user, client.current_server, auto, port)
-        return result
-
+        actions.append(client.list_running)
     if parsed_args.cleanup:
-        result = client.cleanup()
-        if client.current_server:
-            save_config(host, user, client.current_server, auto, port)
-        return result
-
+        actions.append(client.cleanup)
     if parsed_args.attach is not None:
         # parsed_args.attach is "" if --attach with no value, or the session name
-        session = parsed_args.attach if parsed_args.attach else None
-        result = client.attach(session)
-        if client.current_server:
-            save_config(host, user, client.current_server, auto, port)
-        return result
-
+        actions.append(functools.partial(client.attach, parsed_args.attach or None))
     if parsed_args.kill is not None:
         # parsed_args.kill is "" if --kill with no value, or the session name
-        session = parsed_args.kill if parsed_args.kill else None
-        result = client.kill(session, force=parsed_args.yes)
-        if client.current_server:
-            save_config(host, user, client.current_server, auto, port)
+        actions.append(
+            functools.partial(
+                client.kill, parsed_args.kill or None, force=parsed_args.yes
+            )
+        )
+
+    if actions:
+        result = EXIT_COMPLETED
+        with client:
+            for action in actions:
+                result = action()
+                if result != EXIT_COMPLETED:
+                    break
         return result
 
-    user_cmd = " ".join(command_args)
+    if len(command_args) > 1:
+        # Unquoted words were already split by the local shell; quote each so
+        # the remote shell sees the same arguments. A single (quoted) command
+        # string is passed through as-is to keep operators and variables.
+        import shlex
+
+        user_cmd = shlex.join(command_args)
+    else:
+        user_cmd = command_args[0] if command_args else ""
     if not user_cmd:
+        if not sys.stdin.isatty():
+            print(error("Command is required."))
+            return 1
         user_cmd = input("[?] Enter the command to run on server: ").strip()
 
-    result = client.execute(
+    return client.execute(
         user_cmd,
         timeout=parsed_args.timeout,
         idle_timeout=parsed_args.idle_timeout,
@@ -345,9 +583,6 @@ def main(args: list[str] | None = None) -> int:
         force=parsed_args.force,
         auto=auto,
     )
-    if client.current_server:
-        save_config(host, user, client.current_server, auto, port)
-    return result
 
 
 if __name__ == "__main__":
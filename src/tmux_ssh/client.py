@@ -94,10 +94,25 @@ class TmuxSSHClient:
         self.config = config
         self._password_provider = password_provider
         self._client: paramiko.SSHClient | None = None
+        self._keep_open = False
+        self._checked_client: paramiko.SSHClient | None = None
         self._last_server = last_server
         self._server_changed_callback = server_changed_callback
         self._current_server: str | None = None
 
+    def __enter__(self) -> TmuxSSHClient:
+        """Keep one SSH connection open across operations until exit."""
+        self._keep_open = True
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the shared SSH connection."""
+        self._keep_open = False
+        self._checked_client = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
     def get_credentials(self) -> str:
         """Retrieve credentials from keyring or prompt user securely."""
         keyring_key = f"{self.config.username}@{self.config.hostname}"
@@ -272,21 +287,37 @@ class TmuxSSHClient:
         This method:
         1. First tries SSH agent authentication (no password prompt)
         2. If agent fails, prompts for credentials and tries other methods
+
+        Inside a ``with client:`` block the connection is opened once and
+        reused by every operation.
         """
+        if self._client is not None:
+            return self._client
+
         # First, try connecting with SSH agent only (no password)
         try:
             client = self._create_ssh_client(password=None)
-            return client
         except paramiko.AuthenticationException:
-            pass  # Agent auth failed, fall back to password
+            # Agent failed, get credentials and try again
+            password = self.get_credentials()
+            client = self._create_ssh_client(password=password)
 
-        # Agent failed, get credentials and try again
-        password = self.get_credentials()
-        return self._create_ssh_client(password=password)
+        if self._keep_open:
+            self._client = client
+        return client
+
+    def _close(self, client: paramiko.SSHClient) -> None:
+        """Close a connection unless it is shared across operations."""
+        if client is not self._client:
+            client.close()
 
     def _check_server_change(self, client: paramiko.SSHClient) -> None:
         """Check if connected to a different server than before and warn user."""
+        if client is self._checked_client:
+            return  # Shared connection, already checked by an earlier operation
         self._current_server = self._get_remote_hostname(client)
+        if client is self._client:
+            self._checked_client = client
 
         if self._last_server and self._current_server != self._last_server:
             print(f"\n{warning('WARNING: Server changed!')}")
@@ -427,7 +458,7 @@ class TmuxSSHClient:
 
             if not output:
                 print(info("No tmux sessions found."))
-                client.close()
+                self._close(client)
                 return EXIT_COMPLETED
 
             sessions = output.split("\n")
@@ -472,7 +503,7 @@ class TmuxSSHClient:
                 print(info(f"Kept session(s): {', '.join(kept)}"))
 
             self._update_timestamp()
-            client.close()
+            self._close(client)
             return EXIT_COMPLETED
 
         except Exception as e:
@@ -525,7 +556,7 @@ class TmuxSSHClient:
             if not output:
                 print(info("No running commands found."))
                 self._update_timestamp()
-                client.close()
+                self._close(client)
                 return EXIT_COMPLETED
 
             # Parse lock files into blocks
@@ -610,7 +641,7 @@ class TmuxSSHClient:
                 print(info("No running commands found."))
 
             self._update_timestamp()
-            client.close()
+            self._close(client)
             return EXIT_COMPLETED
 
         except Exception as e:
@@ -644,7 +675,7 @@ class TmuxSSHClient:
 
                 if not all_sessions:
                     print(warning("No running commands found (no lock files)."))
-                    client.close()
+                    self._close(client)
                     return EXIT_ERROR
 
                 if len(all_sessions) == 1:
@@ -663,7 +694,7 @@ class TmuxSSHClient:
                         )
                     )
                     print(info("Or use 'tmux-ssh --list' to see details."))
-                    client.close()
+                    self._close(client)
                     return EXIT_ERROR
 
             print(info(f"Attaching to session: {session_name}"))
@@ -717,7 +748,7 @@ class TmuxSSHClient:
                             "Check 'tmux-ssh --list' on each server to find where the session is running."
                         )
                     )
-                client.close()
+                self._close(client)
                 return EXIT_ERROR
 
             # Check if command is running
@@ -729,7 +760,7 @@ class TmuxSSHClient:
                 )
                 log_symlink = self.get_log_symlink(session_name, self.config.log_dir)
                 print(info(f"You can view the latest log at: {log_symlink}"))
-                client.close()
+                self._close(client)
                 return EXIT_COMPLETED
 
             # Get the log file from lock file
@@ -798,7 +829,7 @@ class TmuxSSHClient:
 
             print(f"\n{success('Command completed.')}")
             self._update_timestamp()
-            client.close()
+            self._close(client)
             return EXIT_COMPLETED
 
         except Exception as e:
@@ -835,7 +866,7 @@ class TmuxSSHClient:
 
                 if not all_sessions:
                     print(warning("No running commands found (no lock files)."))
-                    client.close()
+                    self._close(client)
                     return EXIT_ERROR
 
                 if len(all_sessions) == 1:
@@ -854,7 +885,7 @@ class TmuxSSHClient:
                         )
                     )
                     print(info("Or use 'tmux-ssh --list' to see details."))
-                    client.close()
+                    self._close(client)
                     return EXIT_ERROR
 
             # Check if command is running
@@ -864,7 +895,7 @@ class TmuxSSHClient:
                         f"No command currently running in session '{session_name}'."
                     )
                 )
-                client.close()
+                self._close(client)
                 return EXIT_COMPLETED
 
             # Get lock file info before killing
@@ -897,7 +928,7 @@ class TmuxSSHClient:
                         f"tmux-ssh -H {lock_server} --kill {session_name}"
                     )
                 )
-                client.close()
+                self._close(client)
                 return EXIT_ERROR
 
             # Verify tmux session actually exists on this server
@@ -940,7 +971,7 @@ class TmuxSSHClient:
                             "Check 'tmux-ssh --list' on each server to find where the session is running."
                         )
                     )
-                client.close()
+                self._close(client)
                 return EXIT_ERROR
 
             # Show what we're about to kill
@@ -957,11 +988,11 @@ class TmuxSSHClient:
                     response = input("\n[?] Kill this command? [y/N]: ").strip().lower()
                     if response not in {"y", "yes"}:
                         print(info("Cancelled."))
-                        client.close()
+                        self._close(client)
                         return EXIT_COMPLETED
                 except (EOFError, KeyboardInterrupt):
                     print("\n" + info("Cancelled."))
-                    client.close()
+                    self._close(client)
                     return EXIT_COMPLETED
 
             # Send Ctrl+C to the tmux session
@@ -978,7 +1009,7 @@ class TmuxSSHClient:
             print(success(f"Killed command in session '{session_name}'."))
 
             self._update_timestamp()
-            client.close()
+            self._close(client)
             return EXIT_COMPLETED
 
         except Exception as e:
@@ -1044,7 +1075,7 @@ class TmuxSSHClient:
                         print("    --new   : Run in a new session (safe concurrency)")
                         print("    --force : Override and kill existing command")
                         print("    --auto  : Enable auto-create new session (default)")
-                        client.close()
+                        self._close(client)
                         return EXIT_BLOCKED
 
             log_file = self.get_log_file(session_name, self.config.log_dir)
@@ -1193,7 +1224,7 @@ class TmuxSSHClient:
                         )
                         print(info(f"Log file: {log_file}"))
                         self._update_timestamp()
-                        client.close()
+                        self._close(client)
                         return EXIT_STILL_RUNNING
 
                     if idle_time > idle_timeout:
@@ -1207,7 +1238,7 @@ class TmuxSSHClient:
                         )
                         print(info(f"Log file: {log_file}"))
                         self._update_timestamp()
-                        client.close()
+                        self._close(client)
                         return EXIT_STILL_RUNNING
 
                 except Exception:
@@ -1215,7 +1246,7 @@ class TmuxSSHClient:
 
             print(f"\n{success('Command completed.')}")
             self._update_timestamp()
-            client.close()
+            self._close(client)
             return EXIT_COMPLETED
 
         except Exception as e:
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
 import pytest
 
+from tmux_ssh import cli
 from tmux_ssh.client import Config
 
 # Test configuration for live integration tests
@@ -23,6 +26,20 @@ def mock_config() -> Config:
     )
 
 
+@pytest.fixture
+def cli_paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> tuple[Path, Path]:
+    """Redirect the CLI config file and state directory into tmp_path.
+
+    Returns:
+        (config_file, state_dir)
+    """
+    config_file = tmp_path / "config"
+    state_dir = tmp_path / "state"
+    monkeypatch.setattr(cli, "_config_file", lambda: str(config_file))
+    monkeypatch.setattr(cli, "_state_dir", lambda: str(state_dir))
+    return config_file, state_dir
+
+
 @pytest.fixture
 def integration_config() -> Config:
     """Create configuration for integration tests."""
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import io
+import os
+from collections.abc import Callable
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -94,6 +98,25 @@ class TestTmuxSSHClient:
 
         assert client._password_provider is provider
 
+    def test_connection_shared_within_context(self, mock_config: Config) -> None:
+        """Test that operations inside ``with client:`` reuse one connection."""
+        mock_ssh_client = MagicMock()
+        client = TmuxSSHClient(mock_config)
+
+        with patch.object(
+            client, "_create_ssh_client", return_value=mock_ssh_client
+        ) as mock_create:
+            with client:
+                first = client._connect()
+                client._close(first)
+                second = client._connect()
+                client._close(second)
+                mock_ssh_client.close.assert_not_called()
+
+        assert first is second
+        mock_create.assert_called_once()
+        mock_ssh_client.close.assert_called_once()
+
 
 class TestCredentials:
     """Tests for credential management."""
@@ -101,13 +124,13 @@ class TestCredentials:
     def test_get_credentials_with_valid_timestamp(
         self,
         mock_config: Config,
-        tmp_path: pytest.TempPathFactory,
+        tmp_path: Path,
     ) -> None:
         """Test that valid timestamp prevents password prompt."""
         from datetime import datetime
 
         # Create a valid timestamp file
-        timestamp_file = tmp_path / "timestamp"  # type: ignore[operator]
+        timestamp_file = tmp_path / "timestamp"
         timestamp_file.write_text(datetime.now().isoformat())
 
         config = Config(
@@ -296,6 +319,254 @@ class TestCLI:
 
         assert exc_info.value.code == 0
 
+    @pytest.mark.usefixtures("cli_paths")
+    def test_cli_no_prompt_without_tty(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that missing values fail instead of prompting in scripts."""
+        from tmux_ssh import cli
+
+        monkeypatch.setattr("sys.stdin", io.StringIO())
+
+        with patch("builtins.input") as mock_input:
+            assert cli.main(["uptime"]) == 1
+
+        mock_input.assert_not_called()
+
+    @pytest.mark.usefixtures("cli_paths")
+    def test_cli_command_args_quoted(self) -> None:
+        """Test that multi-word commands keep their argument boundaries."""
+        from tmux_ssh import cli
+
+        with patch.object(
+            TmuxSSHClient, "execute", return_value=EXIT_COMPLETED
+        ) as mock_execute:
+            cli.main(["user@host.com", "cat", "my file.txt"])
+            cli.main(["user@host.com", "echo $HOME && ls"])
+
+        assert mock_execute.call_args_list[0].args[0] == "cat 'my file.txt'"
+        assert mock_execute.call_args_list[1].args[0] == "echo $HOME && ls"
+
+    @pytest.mark.usefixtures("cli_paths")
+    @pytest.mark.parametrize(
+        ("list_result", "expected_calls"),
+        [
+            (EXIT_COMPLETED, ["list", "cleanup", "attach", "kill"]),
+            (EXIT_ERROR, ["list"]),
+        ],
+    )
+    def test_cli_combined_verbs(
+        self, list_result: int, expected_calls: list[str]
+    ) -> None:
+        """Test that combined verbs run in order over one SSH connection."""
+        from tmux_ssh import cli
+
+        calls: list[str] = []
+
+        def verb(name: str, result: int) -> Callable[..., int]:
+            def run(client: TmuxSSHClient, *args: object, **kwargs: object) -> int:
+                calls.append(name)
+                client._close(client._connect())
+                return result
+
+            return run
+
+        with (
+            patch.object(
+                TmuxSSHClient, "_create_ssh_client", return_value=MagicMock()
+            ) as mock_create,
+            patch.object(TmuxSSHClient, "list_running", verb("list", list_result)),
+            patch.object(TmuxSSHClient, "cleanup", verb("cleanup", EXIT_COMPLETED)),
+            patch.object(TmuxSSHClient, "attach", verb("attach", EXIT_COMPLETED)),
+            patch.object(TmuxSSHClient, "kill", verb("kill", EXIT_COMPLETED)),
+        ):
+            # Verbs given out of order still run list -> cleanup -> attach -> kill
+            result = cli.main(["user@host.com", "-k", "-a", "--cleanup", "-l"])
+
+        assert result == list_result
+        assert calls == expected_calls
+        mock_create.assert_called_once()
+        mock_create.return_value.close.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            [],
+            ["user@host.com"],
+            ["user@host.com:2222", "ls -la"],
+            ["-n", "-f", "user@host.com", "echo", "hi"],
+            ["user@host.com", "uptime", "-y"],
+        ],
+    )
+    def test_fast_parse_matches_argparse(self, argv: list[str]) -> None:
+        """Test that the fast-path parser agrees with argparse."""
+        from tmux_ssh.cli import _fast_parse, _slow_parse
+
+        assert _fast_parse(argv) == _slow_parse(argv)
+
+    @pytest.mark.parametrize(
+        ("arg", "expected"),
+        [
+            ("user@host", ("user", "host", None)),
+            ("user@host:2222", ("user", "host", 2222)),
+            ("host", (None, "host", None)),
+            ("host:22", (None, "host", 22)),
+        ],
+    )
+    def test_parse_connection_target(
+        self, arg: str, expected: tuple[str | None, str | None, int | None]
+    ) -> None:
+        """Test parsing of user@host:port targets."""
+        from tmux_ssh.cli import parse_connection_target
+
+        assert parse_connection_target(arg) == expected
+
+    @pytest.mark.parametrize("arg", ["host:abc", "host:0", "host:65536"])
+    def test_parse_connection_target_bad_port(self, arg: str) -> None:
+        """Test that invalid ports are rejected."""
+        from tmux_ssh.cli import parse_connection_target
+
+        with pytest.raises(ValueError):
+            parse_connection_target(arg)
+
+    def test_port_flag_validated(self) -> None:
+        """Test that -p rejects out-of-range ports."""
+        from tmux_ssh.cli import main
+
+        with pytest.raises(SystemExit) as exc_info:
+            main(["-p", "70000", "uptime"])
+
+        assert exc_info.value.code == 2
+
+    def test_fast_parse_defers_unknown_flags(self) -> None:
+        """Test that uncommon flags fall back to argparse."""
+        from tmux_ssh.cli import _fast_parse
+
+        assert _fast_parse(["-l"]) is None
+        assert _fast_parse(["user@host.com", "-n", "ls"]) is None
+
+
+class TestSavedConfig:
+    """Tests for persisting CLI settings."""
+
+    @pytest.mark.usefixtures("cli_paths")
+    def test_save_and_load_roundtrip(self) -> None:
+        """Test that saved settings are loaded back."""
+        from tmux_ssh import cli
+
+        cli.save_config("host", "user", False, 2222)
+
+        assert cli.load_saved_config() == cli.SavedConfig(
+            host="host", user="user", port=2222, auto_new_session=False
+        )
+
+    @pytest.mark.usefixtures("cli_paths")
+    def test_save_skipped_when_unchanged(self) -> None:
+        """Test that an unchanged config is not rewritten."""
+        from tmux_ssh import cli
+
+        cli.save_config("host", "user", True, 22)
+        saved = cli.load_saved_config()
+
+        with patch.object(cli, "_write_config") as mock_write:
+            cli.save_config("host", "user", True, 22, saved)
+            cli.save_config("host", "user", True, 22)
+
+        mock_write.assert_not_called()
+
+    def test_load_ignores_bad_values(self, cli_paths: tuple[Path, Path]) -> None:
+        """Test that malformed port/auto values fall back to defaults."""
+        from tmux_ssh import cli
+
+        config_file, _state_dir = cli_paths
+        config_file.write_text(
+            "host=host\nuser=user\nport=70000\nauto_new_session=false\n"
+        )
+
+        assert cli.load_saved_config() == cli.SavedConfig(host="host", user="user")
+
+    def test_load_sees_rewrite_with_same_mtime(
+        self, cli_paths: tuple[Path, Path]
+    ) -> None:
+        """Test that a rewrite within one timestamp tick is not served stale."""
+        from tmux_ssh import cli
+
+        config_file, _state_dir = cli_paths
+        cli.save_config("host", "user", True, 22)
+        mtime_ns = config_file.stat().st_mtime_ns
+        assert cli.load_saved_config().host == "host"
+
+        cli.save_config("other-host", "user", True, 22)
+        os.utime(config_file, ns=(mtime_ns, mtime_ns))
+
+        assert cli.load_saved_config().host == "other-host"
+
+    @pytest.mark.usefixtures("cli_paths")
+    def test_last_server_saved_per_host(self) -> None:
+        """Test that the last server is remembered separately for each host."""
+        from tmux_ssh import cli
+
+        cli.save_last_server("host-a", "server1")
+        cli.save_last_server("host-b", "server2")
+
+        assert cli.load_last_server("host-a") == "server1"
+        assert cli.load_last_server("host-b") == "server2"
+        assert cli.load_last_server("host-c") is None
+
+    @pytest.mark.parametrize("argv", [["-C"], ["-l"], ["-C", "-H", "other-host"]])
+    def test_legacy_last_server_migrated(
+        self, cli_paths: tuple[Path, Path], argv: list[str]
+    ) -> None:
+        """Test that last_server from an older config moves to the state file."""
+        from tmux_ssh import cli
+
+        config_file, _state_dir = cli_paths
+        config_file.write_text(
+            '{"host": "host", "user": "user", "port": 22, '
+            '"auto_new_session": true, "last_server": "node1"}'
+        )
+
+        def list_running(client: TmuxSSHClient) -> int:
+            client._current_server = "node1"
+            return EXIT_COMPLETED
+
+        with patch.object(TmuxSSHClient, "clear_credentials"):
+            with patch.object(TmuxSSHClient, "list_running", list_running):
+                cli.main(argv)
+
+        assert cli.load_saved_config().last_server is None
+        assert cli.load_last_server("host") == "node1"
+
+    def test_config_file_env_override(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that TMUX_SSH_CONFIG redirects the config file and state dir."""
+        from tmux_ssh import cli
+
+        monkeypatch.setenv("TMUX_SSH_CONFIG", str(tmp_path / "custom"))
+        cli._config_file.cache_clear()
+        cli._state_dir.cache_clear()
+        try:
+            assert cli._config_file() == str(tmp_path / "custom")
+            cli.save_last_server("host", "node1")
+            assert (tmp_path / "last_server_host").exists()
+            assert cli.load_last_server("host") == "node1"
+        finally:
+            cli._config_file.cache_clear()
+            cli._state_dir.cache_clear()
+
+    def test_legacy_json_config_migrated(self, cli_paths: tuple[Path, Path]) -> None:
+        """Test that a JSON config from older versions is read and rewritten."""
+        from tmux_ssh import cli
+
+        config_file, _state_dir = cli_paths
+        config_file.write_text(
+            '{"host": "host", "user": "user", "port": 22, "auto_new_session": true}'
+        )
+
+        expected = cli.SavedConfig(host="host", user="user")
+        assert cli.load_saved_config() == expected
+        assert config_file.read_text().startswith("host=host\n")
+        assert cli.load_saved_config() == expected
+
 
 class TestListRunning:
     """Tests for list_running with stale lock detection."""